@@ -1,8 +1,9 @@
 import logging
 
-from fastapi import BackgroundTasks, FastAPI
+from fastapi import BackgroundTasks, FastAPI, Query
 from fastapi.responses import JSONResponse
 
+from controller.history import EventKind
 from controller.lle.exceptions import BaseLLEException
 from controller.root_controller import setup as setup_root_controller
 
@@ -62,6 +63,15 @@ async def status():
     return {"status": status, "systems": system_statuses}
 
 
+@app.get("/history")
+async def history(after: int | None = None, kind: EventKind | None = None, limit: int = Query(100, ge=1)) -> dict:
+    """
+    Returns events recorded by the root controller polling loop, oldest first. Pass the returned cursor
+    as `after` to fetch only newer events. At most as many events as the history holds are returned.
+    """
+    return root_controller.history.query(after=after, kind=kind, limit=limit)
+
+
 @app.post("/lle/start_settling")
 async def lle_start_settling() -> dict:
     """
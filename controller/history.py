@@ -0,0 +1,137 @@
+import asyncio
+import json
+import logging
+import time
+from enum import Enum
+from typing import Any
+
+
+class EventKind(Enum):
+    plc_should_start = "plc_should_start"
+    lle_settling_started = "lle_settling_started"
+    lle_draining_started = "lle_draining_started"
+    lle_status_changed = "lle_status_changed"
+    lle_results = "lle_results"
+    controller_stopped = "controller_stopped"
+    error = "error"
+
+
+class EventHistory:
+    """
+    EventHistory is a fixed-size ring buffer of events emitted by the root controller polling loop.
+    Slots are preallocated as parallel lists, so recording an event only overwrites four slots and never grows
+    the buffer. Every event gets a monotonically increasing sequence number, which is used as a cursor by readers.
+    When flush_path is set, events are appended to that file as JSON lines by `flush`, which the polling loop
+    calls once `flush_ready` reports a full batch of flush_batch_size events. The file is written in a worker thread,
+    and a batch that fails to be written is dropped, so disk errors never reach the polling loop.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1024,
+        flush_path: str | None = None,
+        flush_batch_size: int = 64,
+    ):
+        if capacity <= 0:
+            raise ValueError("History capacity must be positive")
+
+        self.capacity = capacity
+        self.flush_path = flush_path
+        self.flush_batch_size = min(max(flush_batch_size, 1), capacity)
+
+        self._seqs = [-1] * capacity
+        self._timestamps = [0.0] * capacity
+        self._kinds: list[EventKind | None] = [None] * capacity
+        self._values: list[Any] = [None] * capacity
+
+        self._next_seq = 0
+        self._flushed_seq = 0
+        self._flush_failed = False
+        self._flush_lock = asyncio.Lock()
+
+    @property
+    def next_seq(self) -> int:
+        return self._next_seq
+
+    @property
+    def oldest_seq(self) -> int:
+        return max(0, self._next_seq - self.capacity)
+
+    def record(self, kind: EventKind, value: Any = None):
+        seq = self._next_seq
+        slot = seq % self.capacity
+        self._seqs[slot] = seq
+        self._timestamps[slot] = time.time()
+        self._kinds[slot] = kind
+        self._values[slot] = value
+        self._next_seq = seq + 1
+
+    @property
+    def flush_ready(self) -> bool:
+        return self.flush_path is not None and self._next_seq - self._flushed_seq >= self.flush_batch_size
+
+    def query(
+        self,
+        after: int | None = None,
+        kind: EventKind | None = None,
+        limit: int = 100,
+    ) -> dict:
+        """
+        Returns events with a sequence number greater than `after`, oldest first, optionally filtered by kind.
+        The returned cursor should be passed as `after` to continue reading from where the previous call stopped.
+        `truncated` is set when events after the cursor were overwritten, or when the cursor is ahead of the history,
+        e.g. because it was issued before the controller restarted; reading then starts from the oldest event.
+        """
+        limit = min(limit, self.capacity)
+        reset = after is not None and after >= self._next_seq
+        start = self.oldest_seq if after is None or reset else max(after + 1, self.oldest_seq)
+        events = []
+        cursor = start - 1
+
+        for seq in range(start, self._next_seq):
+            if len(events) >= limit:
+                break
+            cursor = seq
+            slot = seq % self.capacity
+            if kind is not None and self._kinds[slot] != kind:
+                continue
+            events.append(self._event(slot))
+
+        return {
+            "events": events,
+            "cursor": min(cursor, self._next_seq - 1),
+            "truncated": reset or (after is not None and after + 1 < self.oldest_seq),
+        }
+
+    async def flush(self):
+        if self.flush_path is None or self._flushed_seq >= self._next_seq:
+            return
+
+        async with self._flush_lock:
+            start = max(self._flushed_seq, self.oldest_seq)
+            lines = [json.dumps(self._event(seq % self.capacity)) for seq in range(start, self._next_seq)]
+            self._flushed_seq = self._next_seq
+            if not lines:
+                return
+
+            try:
+                await asyncio.to_thread(self._write, lines)
+            except OSError as e:
+                if not self._flush_failed:
+                    logging.error("Failed to flush history to %s, dropping events: %s", self.flush_path, e)
+                self._flush_failed = True
+                return
+
+            self._flush_failed = False
+
+    def _write(self, lines: list[str]):
+        with open(self.flush_path, "a") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def _event(self, slot: int) -> dict:
+        return {
+            "seq": self._seqs[slot],
+            "timestamp": self._timestamps[slot],
+            "kind": self._kinds[slot].value,
+            "value": self._values[slot],
+        }
@@ -0,0 +1,393 @@
+"""
+Load-generation harness for the controller HTTP API.
+
+The FastAPI app from controller.api is driven in-process over ASGI, with the LLE and PLC clients replaced by local
+stand-ins that count upstream calls and simulate device latency. Scenarios run until a wall-clock deadline with
+concurrent pollers, so the number and interleaving of requests vary between runs. The seed only fixes the sequence
+of endpoints each poller picks and the jitter of poller and churn intervals.
+
+Run all predefined scenarios and print a comparison table:
+
+    python -m controller.loadtest
+
+Run selected scenarios with overrides:
+
+    python -m controller.loadtest status-pollers status-pollers-blocking --duration 5 --device-latency 0.01
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass, field, replace
+from typing import Any
+from urllib.parse import urlencode
+
+from controller.lle.settings import Settings
+
+
+@dataclass
+class Scenario:
+    name: str
+    duration: float = 10.0
+    pollers: int = 10
+    poller_interval: float = 0.0
+    poller_paths: tuple[str, ...] = ("/status", "/lle/results", "/plc/is-started")
+    churn_interval: float | None = None
+    device_latency: float = 0.005
+    blocking_lle: bool = False
+    blocking_plc: bool = False
+    polling_interval: float = 0.1
+    seed: int = 0
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in [
+        Scenario(name="status-pollers"),
+        Scenario(name="status-pollers-blocking", blocking_lle=True),
+        Scenario(name="status-pollers-with-churn", churn_interval=0.5),
+        Scenario(name="status-pollers-with-churn-blocking", churn_interval=0.5, blocking_lle=True),
+        Scenario(name="grafana-airflow-operators", pollers=3, poller_interval=1.0, churn_interval=2.0),
+    ]
+}
+
+
+class RequestScope:
+    """
+    RequestScope marks device calls made while an API request is being handled. It is shared through a context
+    variable with everything the request runs, including background tasks started by the endpoint, and is closed
+    once the response is sent, so later calls from those background tasks are counted separately.
+    """
+
+    def __init__(self):
+        self.closed = False
+
+
+_request_scope: ContextVar[RequestScope | None] = ContextVar("request_scope", default=None)
+
+
+class DeviceStandIn:
+    """
+    DeviceStandIn counts upstream calls and waits for the configured latency. With blocking=True the wait blocks
+    the event loop, the same way the requests-based LLE client does against a real device.
+    """
+
+    def __init__(self, latency: float, blocking: bool):
+        self.latency = latency
+        self.blocking = blocking
+        self.request_calls = 0
+        self.background_calls = 0
+
+    async def _call(self):
+        scope = _request_scope.get()
+        if scope is not None and not scope.closed:
+            self.request_calls += 1
+        else:
+            self.background_calls += 1
+        if self.blocking:
+            time.sleep(self.latency)
+        else:
+            await asyncio.sleep(self.latency)
+
+
+class LLEClientStandIn(DeviceStandIn):
+    def __init__(self, latency: float, blocking: bool):
+        super().__init__(latency, blocking)
+        self.status = "idle"
+
+    async def get_status(self) -> dict:
+        await self._call()
+        return {"status": self.status}
+
+    async def start_settling(self, settings: Settings) -> dict:
+        await self._call()
+        self.status = "running"
+        return {"status": self.status}
+
+    async def start_draining(self, settings: Settings) -> dict:
+        await self._call()
+        self.status = "running"
+        return {"status": self.status}
+
+    async def stop(self) -> dict:
+        await self._call()
+        self.status = "stopped"
+        return {"status": self.status}
+
+    async def get_results(self) -> dict:
+        await self._call()
+        return {"results": None}
+
+
+class PLCClientStandIn(DeviceStandIn):
+    def __init__(self, latency: float, blocking: bool):
+        super().__init__(latency, blocking)
+        self.is_started = False
+        self.lle_status = None
+
+    async def get_is_started(self) -> bool:
+        await self._call()
+        return self.is_started
+
+    async def set_is_started(self, value: bool) -> Any:
+        await self._call()
+        self.is_started = value
+
+    async def set_lle_status(self, status: str) -> Any:
+        await self._call()
+        self.lle_status = status
+
+    async def set_lle_results(self, results: Any) -> Any:
+        await self._call()
+
+
+class ASGIDriver:
+    """
+    ASGIDriver issues requests directly against an ASGI app. A request completes as soon as the response body
+    is sent, so background tasks started by an endpoint (e.g. the polling loop started by /start) keep running
+    in the app without blocking the caller.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._tasks: set[asyncio.Task] = set()
+
+    async def request(self, method: str, path: str, params: dict | None = None) -> int:
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": urlencode(params or {}).encode(),
+            "root_path": "",
+            "headers": [(b"host", b"loadtest")],
+            "client": ("127.0.0.1", 0),
+            "server": ("loadtest", 80),
+        }
+        done = asyncio.get_running_loop().create_future()
+        status_code = 500
+        request_scope = RequestScope()
+
+        async def receive() -> dict:
+            if not done.done():
+                return {"type": "http.request", "body": b"", "more_body": False}
+            return {"type": "http.disconnect"}
+
+        async def send(message: dict):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                request_scope.closed = True
+                if not done.done():
+                    done.set_result(None)
+
+        def on_app_done(task: asyncio.Task):
+            self._tasks.discard(task)
+            if done.done():
+                return
+            if task.cancelled():
+                done.cancel()
+            else:
+                done.set_exception(task.exception() or RuntimeError(f"No response sent for {path}"))
+
+        token = _request_scope.set(request_scope)
+        try:
+            task = asyncio.create_task(self.app(scope, receive, send))
+        finally:
+            _request_scope.reset(token)
+        self._tasks.add(task)
+        task.add_done_callback(on_app_done)
+
+        await done
+        return status_code
+
+    async def close(self):
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+@dataclass
+class Report:
+    scenario: Scenario
+    elapsed: float = 0.0
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: int = 0
+    request_device_calls: int = 0
+    background_device_calls: int = 0
+
+    @property
+    def api_calls(self) -> int:
+        return sum(len(latencies) for latencies in self.latencies.values())
+
+    @property
+    def throughput(self) -> float:
+        return self.api_calls / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def fan_out(self) -> float:
+        return self.request_device_calls / self.api_calls if self.api_calls > 0 else 0.0
+
+    @property
+    def background_device_rate(self) -> float:
+        return self.background_device_calls / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> dict:
+        all_latencies = [latency for latencies in self.latencies.values() for latency in latencies]
+        return {
+            "scenario": self.scenario.name,
+            "api_calls": self.api_calls,
+            "errors": self.errors,
+            "throughput_rps": round(self.throughput, 1),
+            **_percentiles_ms(all_latencies),
+            "fan_out": round(self.fan_out, 2),
+            "background_device_rps": round(self.background_device_rate, 1),
+            "endpoints": {path: _percentiles_ms(latencies) for path, latencies in sorted(self.latencies.items())},
+        }
+
+
+def _percentiles_ms(latencies: list[float]) -> dict:
+    if not latencies:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+
+    ordered = sorted(latencies)
+
+    def at(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 2)
+
+    return {"p50_ms": at(0.50), "p95_ms": at(0.95), "p99_ms": at(0.99), "max_ms": round(ordered[-1] * 1000, 2)}
+
+
+async def run_scenario(scenario: Scenario) -> Report:
+    # controller.api configures INFO logging on import, which would bury the report under start/stop lines,
+    # and basicConfig is a no-op once the root logger is configured
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    from controller.api import app, root_controller
+    from controller.history import EventHistory
+    from controller.root_controller import Status
+
+    lle_client = LLEClientStandIn(scenario.device_latency, scenario.blocking_lle)
+    plc_client = PLCClientStandIn(scenario.device_latency, scenario.blocking_plc)
+    root_controller.lle._client = lle_client
+    root_controller.plc._client = plc_client
+    root_controller.polling_interval = scenario.polling_interval
+    root_controller.status = Status.idle
+    root_controller.history = EventHistory()
+
+    driver = ASGIDriver(app)
+    report = Report(scenario=scenario)
+    rng = random.Random(scenario.seed)
+    deadline = time.perf_counter() + scenario.duration
+
+    async def timed(method: str, path: str, params: dict | None = None):
+        started = time.perf_counter()
+        try:
+            status_code = await driver.request(method, path, params)
+        except Exception:
+            status_code = 500
+        report.latencies[f"{method} {path}"].append(time.perf_counter() - started)
+        if status_code >= 400:
+            report.errors += 1
+
+    async def poller(seed: int):
+        poller_rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            await timed("GET", poller_rng.choice(scenario.poller_paths))
+            if scenario.poller_interval > 0:
+                await asyncio.sleep(scenario.poller_interval * poller_rng.uniform(0.5, 1.5))
+            else:
+                await asyncio.sleep(0)
+
+    async def churner(seed: int):
+        churn_rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            await timed("GET", "/start")
+            await asyncio.sleep(scenario.churn_interval * churn_rng.uniform(0.5, 1.5))
+            await timed("GET", "/stop")
+            await asyncio.sleep(scenario.churn_interval * churn_rng.uniform(0.5, 1.5))
+
+    workers = [poller(rng.getrandbits(32)) for _ in range(scenario.pollers)]
+    if scenario.churn_interval is not None:
+        workers.append(churner(rng.getrandbits(32)))
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*workers)
+    finally:
+        report.elapsed = time.perf_counter() - started
+        root_controller.status = Status.stopped
+        await driver.close()
+
+    report.request_device_calls = lle_client.request_calls + plc_client.request_calls
+    report.background_device_calls = lle_client.background_calls + plc_client.background_calls
+    return report
+
+
+def _print_table(reports: list[Report]):
+    columns = [
+        "scenario",
+        "api_calls",
+        "errors",
+        "throughput_rps",
+        "p50_ms",
+        "p95_ms",
+        "p99_ms",
+        "fan_out",
+        "background_device_rps",
+    ]
+    rows = [[str(report.summary()[column]) for column in columns] for report in reports]
+    widths = [max(len(column), *(len(row[i]) for row in rows)) for i, column in enumerate(columns)]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(value.ljust(width) for value, width in zip(row, widths)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the controller API against local device stand-ins")
+    parser.add_argument("scenarios", nargs="*", help=f"scenarios to run, all by default: {', '.join(SCENARIOS)}")
+    parser.add_argument("--duration", type=float, help="override scenario duration in seconds")
+    parser.add_argument("--pollers", type=int, help="override number of concurrent pollers")
+    parser.add_argument("--device-latency", type=float, help="override stand-in device latency in seconds")
+    parser.add_argument("--seed", type=int, help="override scenario seed")
+    parser.add_argument("--json", action="store_true", help="print full reports as JSON")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    overrides = {
+        key: value
+        for key, value in {
+            "duration": args.duration,
+            "pollers": args.pollers,
+            "device_latency": args.device_latency,
+            "seed": args.seed,
+        }.items()
+        if value is not None
+    }
+
+    reports = []
+    for name in args.scenarios or SCENARIOS:
+        scenario = replace(SCENARIOS[name], **overrides)
+        reports.append(asyncio.run(run_scenario(scenario)))
+
+    if args.json:
+        print(json.dumps([report.summary() for report in reports], indent=2))
+    else:
+        _print_table(reports)
+
+
+if __name__ == "__main__":
+    main()
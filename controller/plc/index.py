@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import time
+
+from asyncua import Client as UAClient
+from asyncua import ua
+
+
+class NodeIndex:
+    """
+    NodeIndex resolves OPC UA browse paths to node IDs and caches them, so paths are translated once per server
+    and not on every read or write. Paths are relative to the Objects folder, e.g. "LLE/IsStarted", and every
+    element is looked up in the configured namespace. The index is shared by all clients of the same server URL,
+    see `for_url`. Clients call `validate` after connecting, which at most once per check_interval seconds reads
+    the server's namespace array and start time, and drops the cached node IDs when either has changed, i.e. when
+    the PLC program may have been redeployed. Between checks, operations only do a dictionary lookup.
+    """
+
+    _instances: dict[str, "NodeIndex"] = {}
+
+    def __init__(self, check_interval: float = 60.0):
+        self.check_interval = check_interval
+        self._node_ids: dict[tuple[int | str, str], ua.NodeId] = {}
+        self._server_state: tuple | None = None
+        self._checked_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def for_url(cls, url: str) -> "NodeIndex":
+        if url not in cls._instances:
+            cls._instances[url] = cls()
+        return cls._instances[url]
+
+    def invalidate(self):
+        self._node_ids.clear()
+        self._server_state = None
+        self._checked_at = None
+
+    async def validate(self, client: UAClient):
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+
+        namespace_array, start_time = await client.read_values(
+            [
+                client.get_node(ua.NodeId(ua.ObjectIds.Server_NamespaceArray)),
+                client.get_node(ua.NodeId(ua.ObjectIds.Server_ServerStatus_StartTime)),
+            ]
+        )
+        server_state = (tuple(namespace_array), start_time)
+
+        if self._server_state is not None and server_state != self._server_state and self._node_ids:
+            logging.info("PLC server namespace array or start time changed, resolving PLC nodes again")
+            self._node_ids.clear()
+
+        self._server_state = server_state
+
+    async def resolve(self, client: UAClient, namespace: int | str, path: str, paths: list[str]) -> ua.NodeId:
+        """
+        Returns the node ID for `path`. If it isn't cached yet, it is translated in a single
+        TranslateBrowsePathsToNodeIds request together with the other `paths` that haven't been tried yet, so the
+        first operation after connecting fills the index. Paths that fail to resolve are not cached, and an error is
+        raised only for the path being used. `namespace` is either a namespace index or a namespace URI.
+        """
+        key = (namespace, path)
+        if key in self._node_ids:
+            return self._node_ids[key]
+
+        async with self._lock:
+            if key in self._node_ids:
+                return self._node_ids[key]
+
+            pending = [path] + [
+                path_ for path_ in dict.fromkeys(paths) if path_ != path and (namespace, path_) not in self._node_ids
+            ]
+            results = await self._translate(client, namespace, pending)
+
+            resolved = {}
+            for path_, result in zip(pending, results):
+                if isinstance(result, ua.NodeId):
+                    self._node_ids[(namespace, path_)] = result
+                    resolved[path_] = result
+                elif path_ != path:
+                    logging.warning("Could not resolve PLC node %s: %s", path_, result)
+            if resolved:
+                logging.info("Resolved PLC nodes: %s", resolved)
+
+        if isinstance(results[0], Exception):
+            raise results[0]
+
+        return results[0]
+
+    @staticmethod
+    async def _translate(client: UAClient, namespace: int | str, paths: list[str]) -> list[ua.NodeId | Exception]:
+        namespace_index = namespace if isinstance(namespace, int) else await client.get_namespace_index(namespace)
+
+        browse_paths = []
+        for path in paths:
+            browse_path = ua.BrowsePath()
+            browse_path.StartingNode = ua.NodeId(ua.ObjectIds.ObjectsFolder)
+            browse_path.RelativePath = ua.RelativePath(
+                Elements=[
+                    ua.RelativePathElement(
+                        ReferenceTypeId=ua.NodeId(ua.ObjectIds.HierarchicalReferences),
+                        IsInverse=False,
+                        IncludeSubtypes=True,
+                        TargetName=ua.QualifiedName(name, namespace_index),
+                    )
+                    for name in path.split("/")
+                ]
+            )
+            browse_paths.append(browse_path)
+
+        results = await client.uaclient.translate_browsepaths_to_nodeids(browse_paths)
+
+        node_ids = []
+        for path, result in zip(paths, results):
+            if not result.StatusCode.is_good():
+                node_ids.append(ua.UaStatusCodeError(result.StatusCode.value))
+            elif not result.Targets:
+                node_ids.append(ua.UaError(f"PLC browse path {path} has no targets"))
+            else:
+                node_ids.append(result.Targets[0].TargetId)
+
+        return node_ids
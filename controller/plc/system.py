@@ -1,59 +1,91 @@
+import logging
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Awaitable, Callable
 
 from asyncua import Client as UAClient
-from asyncua import ua
+from asyncua import Node, ua
+from controller.plc.index import NodeIndex
 from controller.system import SystemInterface
 
 
 @dataclass
 class PLCClientSettings:
-    namespace_id: int
-    lle_id: int
-    lle_is_started_id: int
-    lle_status_id: int
-    lle_results_id: int
+    """
+    Every LLE node is addressed either by a numeric node ID in namespace namespace_id, or by a browse path relative
+    to the Objects folder, e.g. "LLE/IsStarted". Browse path elements are looked up in the namespace given by
+    namespace_uri if it is set, and by namespace_id otherwise. A browse path takes precedence over a node ID.
+    """
+
+    namespace_id: int = 2
+    namespace_uri: str | None = None
+    lle_is_started_id: int | None = None
+    lle_status_id: int | None = None
+    lle_results_id: int | None = None
+    lle_is_started_path: str | None = None
+    lle_status_path: str | None = None
+    lle_results_path: str | None = None
+
+    def __post_init__(self):
+        for name in ["lle_is_started", "lle_status", "lle_results"]:
+            if getattr(self, f"{name}_id") is None and getattr(self, f"{name}_path") is None:
+                raise ValueError(f"PLC node {name} needs either {name}_id or {name}_path")
+
+    @property
+    def namespace(self) -> int | str:
+        return self.namespace_uri if self.namespace_uri is not None else self.namespace_id
+
+    @property
+    def paths(self) -> list[str]:
+        return [
+            path
+            for path in [self.lle_is_started_path, self.lle_status_path, self.lle_results_path]
+            if path is not None
+        ]
 
 
 class Client:
     def __init__(self, url: str, settings: PLCClientSettings):
         self.url = url
         self.settings = settings
+        self._index = NodeIndex.for_url(url)
 
     async def get_is_started(self) -> bool:
-        path = self.node_id_for_id(self.settings.lle_is_started_id)
-
-        async with UAClient(self.url) as client:
-            node = client.get_node(path)
-            return await node.read_value()
+        return await self._with_node(
+            self.settings.lle_is_started_id, self.settings.lle_is_started_path, lambda node: node.read_value()
+        )
 
     async def set_is_started(self, value: bool) -> Any:
-        path = self.node_id_for_id(self.settings.lle_is_started_id)
-
-        async with UAClient(self.url) as client:
-            node = client.get_node(path)
-            return await node.write_value(value)
+        return await self._with_node(
+            self.settings.lle_is_started_id, self.settings.lle_is_started_path, lambda node: node.write_value(value)
+        )
 
     async def set_lle_status(self, status: str) -> Any:
-        path = self.node_id_for_id(self.settings.lle_status_id)
-
-        async with UAClient(self.url) as client:
-            node = client.get_node(path)
-            return await node.write_value(status)
+        return await self._with_node(
+            self.settings.lle_status_id, self.settings.lle_status_path, lambda node: node.write_value(status)
+        )
 
     async def set_lle_results(self, results: Any) -> Any:
-        path = self.node_id_for_id(self.settings.lle_results_id)
+        return await self._with_node(
+            self.settings.lle_results_id, self.settings.lle_results_path, lambda node: node.write_value(results)
+        )
 
+    async def _with_node(self, id: int | None, path: str | None, func: Callable[[Node], Awaitable[Any]]) -> Any:
         async with UAClient(self.url) as client:
-            node = client.get_node(path)
-            return await node.write_value(results)
-
-    @staticmethod
-    def path_from_ns_and_id(ns: int, id: int) -> str:
-        return f"ns={ns};i={id}"
-
-    def node_id_for_id(self, id: int) -> ua.NodeId:
-        return ua.NodeId(id, self.settings.namespace_id)
+            if path is None:
+                return await func(client.get_node(ua.NodeId(id, self.settings.namespace_id)))
+
+            await self._index.validate(client)
+            try:
+                return await func(await self._get_node(client, path))
+            except (ua.uaerrors.BadNodeIdUnknown, ua.uaerrors.BadNodeIdInvalid):
+                # the PLC program has changed since the paths were resolved
+                logging.info("PLC node for %s is unknown, resolving PLC nodes again", path)
+                self._index.invalidate()
+                return await func(await self._get_node(client, path))
+
+    async def _get_node(self, client: UAClient, path: str) -> Node:
+        node_id = await self._index.resolve(client, self.settings.namespace, path, self.settings.paths)
+        return client.get_node(node_id)
 
 
 class PLCSystem(SystemInterface):
@@ -1,10 +1,12 @@
 import asyncio
+import functools
 import json
 import logging
 import os
 from datetime import datetime
 from enum import Enum
 
+from controller.history import EventHistory, EventKind
 from controller.lle.settings import Settings as LLEAPISettings
 from controller.lle.system import LLEStatus, LLESystem
 from controller.plc import PLCClientSettings, PLCSystem
@@ -16,17 +18,41 @@ class Status(Enum):
     stopped = "stopped"
 
 
+def _records_errors(poll_func):
+    """
+    Records an exception raised by a polling loop into the controller history before propagating it.
+    """
+
+    @functools.wraps(poll_func)
+    async def wrapper(self: "RootController"):
+        try:
+            return await poll_func(self)
+        except Exception as e:
+            self.history.record(EventKind.error, f"{type(e).__name__}: {getattr(e, 'message', e)}")
+            await self.history.flush()
+            raise
+
+    return wrapper
+
+
 class RootController:
     """
     RootController is the main controller responsible for communication between all underlying systems.
     It starts and stops the underlying systems, and polls them for status updates periodically.
     """
 
-    def __init__(self, plc: PLCSystem, lle: LLESystem, polling_interval: int = 5):
+    def __init__(
+        self,
+        plc: PLCSystem,
+        lle: LLESystem,
+        polling_interval: int = 5,
+        history: EventHistory | None = None,
+    ):
         self.plc = plc
         self.lle = lle
         self.polling_interval = polling_interval
         self.status = Status.idle
+        self.history = history if history is not None else EventHistory()
 
     async def start(self):
         self.status = Status.running
@@ -45,6 +71,7 @@ class RootController:
             self.lle.name: await self.lle.get_status(),
         }
 
+    @_records_errors
     async def poll(self):
         # TODO: use https://pypi.org/project/python-statemachine/ for state machine instead of if-else branching
 
@@ -62,11 +89,11 @@ class RootController:
             # launching underlying systems
 
             should_start = await self.plc.should_start()
-            logging.info("Should start: %s", should_start)
+            self.history.record(EventKind.plc_should_start, should_start)
 
             if should_start:
                 response = await self.lle.start_settling()
-                logging.info("LLE start settling response: %s", response)
+                self.history.record(EventKind.lle_settling_started, response.get("status"))
 
                 # switching PLC to started=False so we don't start the LLE again
                 await self.plc.set_is_started(False)
@@ -81,25 +108,29 @@ class RootController:
                 if not settling_finished:
                     settling_finished = True
                     response = await self.lle.start_draining()
-                    logging.info("LLE start draining response: %s", response)
+                    self.history.record(EventKind.lle_draining_started, response.get("status"))
                 elif settling_finished and not draining_finished:
                     draining_finished = True
                     lle_results = await self.lle.get_results()
 
                 if lle_results is not None:
-                    await self._save_results(lle_results)
+                    output_path = await self._save_results(lle_results)
+                    self.history.record(EventKind.lle_results, output_path)
 
                 # TODO: PLC server must support results
                 # await self.plc.set_lle_results(lle_results)
-                logging.info("LLE results: %s", lle_results)
 
             if lle_status != previous_lle_status:
                 await self.plc.set_lle_status(lle_status.value)
-                logging.info("LLE status changed to: %s", lle_status)
+                self.history.record(EventKind.lle_status_changed, lle_status.value)
                 previous_lle_status = lle_status
 
+            if self.history.flush_ready:
+                await self.history.flush()
+
             await asyncio.sleep(self.polling_interval)
 
+    @_records_errors
     async def poll_draining(self):
         # TODO: use https://pypi.org/project/python-statemachine/ for state machine instead of if-else branching
 
@@ -116,11 +147,11 @@ class RootController:
             # launching underlying systems
 
             should_start = await self.plc.should_start()
-            logging.info("Should start: %s", should_start)
+            self.history.record(EventKind.plc_should_start, should_start)
 
             if should_start:
                 response = await self.lle.start_draining()
-                logging.info("LLE start draining response: %s", response)
+                self.history.record(EventKind.lle_draining_started, response.get("status"))
 
                 # switching PLC to started=False so we don't start the LLE again
                 await self.plc.set_is_started(False)
@@ -137,17 +168,20 @@ class RootController:
                     lle_results = await self.lle.get_results()
 
                 if lle_results is not None:
-                    await self._save_results(lle_results)
+                    output_path = await self._save_results(lle_results)
+                    self.history.record(EventKind.lle_results, output_path)
 
                 # TODO: PLC server must support results
                 # await self.plc.set_lle_results(lle_results)
-                logging.info("LLE results: %s", lle_results)
 
             if lle_status != previous_lle_status:
                 await self.plc.set_lle_status(lle_status.value)
-                logging.info("LLE status changed to: %s", lle_status)
+                self.history.record(EventKind.lle_status_changed, lle_status.value)
                 previous_lle_status = lle_status
 
+            if self.history.flush_ready:
+                await self.history.flush()
+
             await asyncio.sleep(self.polling_interval)
 
     async def _stop_systems(self):
@@ -157,6 +191,8 @@ class RootController:
         lle_status = await self.lle.get_status()
 
         await self.plc.set_lle_status(lle_status.value)
+        self.history.record(EventKind.controller_stopped, lle_status.value)
+        await self.history.flush()
 
         # TODO: PLC server must support results
         # lle_results = await self.lle.get_results()
@@ -164,12 +200,13 @@ class RootController:
         #     await self.plc.set_lle_results(lle_results)
 
     @staticmethod
-    async def _save_results(results: dict):
+    async def _save_results(results: dict) -> str:
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         output_path = f"output/results_{timestamp}.json"
         logging.info("Saving results to %s", output_path)
         with open(output_path, "w") as f:
             f.write(json.dumps(results))
+        return output_path
 
 
 def setup() -> RootController:
@@ -178,11 +215,14 @@ def setup() -> RootController:
         name="PLC",
         url=plc_api_url,
         client_settings=PLCClientSettings(
-            namespace_id=2,
-            lle_id=1,
-            lle_is_started_id=2,
-            lle_status_id=3,
-            lle_results_id=4,
+            namespace_id=int(os.environ.get("PLC_NAMESPACE_ID", "2")),
+            namespace_uri=os.environ.get("PLC_NAMESPACE_URI"),
+            lle_is_started_id=int(os.environ.get("PLC_LLE_IS_STARTED_ID", "2")),
+            lle_status_id=int(os.environ.get("PLC_LLE_STATUS_ID", "3")),
+            lle_results_id=int(os.environ.get("PLC_LLE_RESULTS_ID", "4")),
+            lle_is_started_path=os.environ.get("PLC_LLE_IS_STARTED_PATH"),
+            lle_status_path=os.environ.get("PLC_LLE_STATUS_PATH"),
+            lle_results_path=os.environ.get("PLC_LLE_RESULTS_PATH"),
         ),
     )
 
@@ -196,4 +236,8 @@ def setup() -> RootController:
         settings=lle_api_settings,
     )
 
-    return RootController(plc_system, lle_system)
+    history_capacity = int(os.environ.get("HISTORY_CAPACITY", "1024"))
+    history_flush_path = os.environ.get("HISTORY_FLUSH_PATH")
+    history = EventHistory(capacity=history_capacity, flush_path=history_flush_path)
+
+    return RootController(plc_system, lle_system, history=history)